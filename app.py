@@ -2,45 +2,76 @@ import streamlit as st
 from supabase import create_client
 import os
 import requests
-from ics import Calendar
+from dateutil import tz as dateutil_tz
 from datetime import datetime, timezone, date, timedelta
 import pandas as pd
 import json
+import gzip
+import io
 import re
 import time
 from pathlib import Path
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-import urllib3
 import urllib.parse
 import base64
+import bisect
+import hashlib
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter, itemgetter
+from functools import lru_cache
+from collections import defaultdict
+from dataclasses import dataclass
 
 # Weather API configuration
 WEATHER_API_KEY = st.secrets["openweather"]["api_key"]
 WEATHER_BASE_URL = "https://api.openweathermap.org/data/2.5/forecast"
 
+@st.cache_data(ttl=60 * 60 * 24, show_spinner=False)
+def geocode_address(address):
+    """Look up latitude and longitude with the OpenStreetMap Nominatim API.
+    Cached for a day per address; failed lookups raise, so they are not cached."""
+    # Format address for URL
+    formatted_address = urllib.parse.quote(address)
+    nominatim_url = f"https://nominatim.openstreetmap.org/search?q={formatted_address}&format=json"
+    
+    # Add User-Agent header to comply with Nominatim usage policy
+    headers = {
+        'User-Agent': 'STLCity3GameApp/1.0'
+    }
+    
+    response = lookup_http.get(nominatim_url, headers=headers, timeout=LOOKUP_TIMEOUT)
+    response.raise_for_status()
+    
+    data = response.json()
+    if data:
+        return float(data[0]['lat']), float(data[0]['lon'])
+    return None, None
+
 def get_coordinates_from_address(address):
-    """Get latitude and longitude from an address using OpenStreetMap Nominatim API"""
+    """Get latitude and longitude from an address, or (None, None) if the lookup fails"""
     try:
-        # Format address for URL
-        formatted_address = urllib.parse.quote(address)
-        nominatim_url = f"https://nominatim.openstreetmap.org/search?q={formatted_address}&format=json"
-        
-        # Add User-Agent header to comply with Nominatim usage policy
-        headers = {
-            'User-Agent': 'STLCity3GameApp/1.0'
-        }
-        
-        response = requests.get(nominatim_url, headers=headers)
-        response.raise_for_status()
-        
-        data = response.json()
-        if data:
-            return float(data[0]['lat']), float(data[0]['lon'])
-        return None, None
+        # Normalize so the same field written differently shares one cache entry
+        return geocode_address(" ".join(address.lower().split()))
     except Exception as e:
         return None, None
 
+@st.cache_data(ttl=1800, show_spinner=False)
+def fetch_forecast(lat, lon):
+    """Fetch the 5-day forecast list for a location; shared by every game played there"""
+    params = {
+        'lat': lat,
+        'lon': lon,
+        'appid': WEATHER_API_KEY,
+        'units': 'imperial',  # For Fahrenheit
+        'cnt': 40  # Maximum number of timestamps
+    }
+    response = lookup_http.get(WEATHER_BASE_URL, params=params, timeout=LOOKUP_TIMEOUT)
+    response.raise_for_status()
+    return response.json().get('list', [])
+
 def get_weather_for_time(game_time, address=None):
     """Get weather forecast for a specific game time."""
     if not WEATHER_API_KEY:
@@ -49,12 +80,7 @@ def get_weather_for_time(game_time, address=None):
     try:
         # Only get weather for future games within 5 days (API limitation)
         now = datetime.now(timezone.utc)
-        five_days_from_now = now + timedelta(days=5)
-        
-        if game_time < now:
-            return None
-            
-        if game_time > five_days_from_now:
+        if not now <= game_time <= now + timedelta(days=5):
             return None
 
         # Format address for geocoding
@@ -79,37 +105,16 @@ def get_weather_for_time(game_time, address=None):
         # Convert game time to unix timestamp
         game_timestamp = int(game_time.timestamp())
         
-        # Make API request
-        params = {
-            'lat': lat,
-            'lon': lon,
-            'appid': WEATHER_API_KEY,
-            'units': 'imperial',  # For Fahrenheit
-            'cnt': 40  # Maximum number of timestamps
-        }
-        
-        response = requests.get(WEATHER_BASE_URL, params=params)
-        if not response.ok:
-            return None
-            
-        weather_data = response.json()
-        
-        if 'list' not in weather_data:
+        # One cached forecast request per location, reused by every game there
+        forecasts = fetch_forecast(lat, lon)
+        if not forecasts:
             return None
             
         # Find the forecast closest to game time
-        forecasts = weather_data['list']
-        closest_forecast = None
-        smallest_time_diff = float('inf')
-        
-        for forecast in forecasts:
-            time_diff = abs(forecast['dt'] - game_timestamp)
-            if time_diff < smallest_time_diff:
-                smallest_time_diff = time_diff
-                closest_forecast = forecast
+        closest_forecast = min(forecasts, key=lambda forecast: abs(forecast['dt'] - game_timestamp))
         
         # Only use forecast if within 3 hours of game time
-        if smallest_time_diff > 10800:  # 3 hours in seconds
+        if abs(closest_forecast['dt'] - game_timestamp) > 10800:  # 3 hours in seconds
             return None
             
         weather_description = closest_forecast['weather'][0]['description']
@@ -158,6 +163,58 @@ st.set_page_config(
     layout="wide"
 )
 
+# Attendance bar, game card and map link styles, emitted once per page rather than per event
+st.markdown("""
+    <style>
+    .attendance-status {
+        display: flex;
+        justify-content: space-between;
+        gap: 1rem;
+    }
+    .attendance-bar {
+        background-color: rgba(250, 250, 250, 0.2);
+        border-radius: 4px;
+        height: 8px;
+        margin: 8px 0;
+    }
+    .attendance-bar > div {
+        height: 100%;
+        border-radius: 4px;
+    }
+    .attendance-bar .p-red { background-color: #ff4b4b; }
+    .attendance-bar .p-amber { background-color: #faa; }
+    .attendance-bar .p-green { background-color: #4bb543; }
+    .weather-box {
+        background-color: rgba(255, 243, 176, 0.2);
+        padding: 10px;
+        border-radius: 8px;
+        margin: 10px 0;
+        border: 1px solid rgba(255, 223, 0, 0.3);
+    }
+    .game-title-box {
+        background-color: rgba(65, 105, 225, 0.1);
+        padding: 10px;
+        border-radius: 8px;
+        margin: 10px 0;
+        border: 1px solid rgba(65, 105, 225, 0.2);
+    }
+    .maps-row {
+        display: flex;
+        gap: 10px;
+        margin-top: 5px;
+        margin-bottom: 10px;
+    }
+    .maps-row a {
+        color: white !important;
+        padding: 6px 12px;
+        border-radius: 5px;
+        text-decoration: none;
+    }
+    .maps-row .maps-google { background-color: #4285F4; }
+    .maps-row .maps-apple { background-color: #000000; }
+    </style>
+""", unsafe_allow_html=True)
+
 # Show announcement before login (moved here)
 show_temporary_announcement()
 
@@ -181,19 +238,14 @@ def get_cookie(key):
 
 def set_cookie(key, value):
     """Set cookie value"""
-    current_params = st.query_params
-    encoded_value = urllib.parse.quote_plus(value)  # ✅ encode spaces and full names
-    current_params[key] = [encoded_value]
-    st.query_params = current_params
-
-# Initialize authentication
-username = get_cookie('username')
-if username:
-    st.session_state['user_name'] = username
-    st.session_state['authentication_status'] = True
-elif 'authentication_status' not in st.session_state:
-    st.session_state['authentication_status'] = False
-    st.session_state['user_name'] = None
+    st.query_params[key] = urllib.parse.quote_plus(value)  # ✅ encode spaces and full names
+
+# Initialize authentication; session state is the source of truth once logged in,
+# so the URL is only read on a fresh session and only written on login/logout
+if not st.session_state.get('authentication_status'):
+    username = get_cookie('username')
+    st.session_state['authentication_status'] = bool(username)
+    st.session_state['user_name'] = username or None
 
 if not st.session_state['authentication_status']:
     st.info("👋 Welcome! Please login to RSVP for games")
@@ -215,12 +267,6 @@ if not st.session_state['authentication_status']:
 # Show active user status
 st.success(f"👤 Logged in as: {st.session_state.user_name}")
 
-# Ensure ?username=... is in the URL if user is logged in
-current_params = st.query_params
-if urllib.parse.unquote_plus(current_params.get("username", [None])[0] or "") != st.session_state["user_name"]:
-    current_params["username"] = [urllib.parse.quote_plus(st.session_state["user_name"])]
-    st.query_params = current_params
-
 # Logout button
 if st.button("📱 Logout", type="secondary"):
     st.session_state['user_name'] = None
@@ -229,92 +275,129 @@ if st.button("📱 Logout", type="secondary"):
     st.rerun()
 
 # --- SUPABASE CONFIGURATION ---
-try:
-    # Try to get credentials from Streamlit secrets
-    supabase = create_client(
+@st.cache_resource(show_spinner=False)
+def get_supabase_client():
+    """Create the Supabase client once per process.
+    Its pooled HTTP client is thread-safe, so every session's thread shares it."""
+    return create_client(
         supabase_url=st.secrets["supabase"]["url"],
         supabase_key=st.secrets["supabase"]["key"]
     )
+
+try:
+    # Try to get credentials from Streamlit secrets
+    supabase = get_supabase_client()
 except Exception as e:
     st.error("⚠️ Supabase connection failed. Please check your credentials in Streamlit secrets.")
     st.stop()
 
+# --- QUERY PROJECTIONS ---
+# Fixed select lists keep each hot query's shape identical between calls
+RSVP_ROW_COLUMNS = "event_uid, users:user_id(name), participation, timestamp"
+USER_RSVP_COLUMNS = "id, participation, users:user_id!inner(name)"
+GAME_COLUMNS = "event_uid, name, start_time, location, opponent, result, score"
+
 # --- DATABASE FUNCTIONS ---
-def save_or_update_game(event):
-    """Save or update game information in the database"""
-    try:
+# Defined ahead of the startup block: a cold-start calendar refresh writes games and clears this cache
+@st.cache_data(ttl=300, show_spinner=False)
+def load_all_games():
+    """Fetch every game, parsing start_time once into '_start_dt'.
+    Rows are sorted on '_start_dt' here rather than relying on the database's ordering of
+    start_time (text sorts wrong across UTC offsets), so callers can bisect on it.
+    Cached for five minutes and cleared whenever the games table is written."""
+    response = supabase.table("games").select(GAME_COLUMNS).execute()
+    for game in response.data:
+        game['_start_dt'] = datetime.fromisoformat(game['start_time'])
+    response.data.sort(key=itemgetter('_start_dt'))
+    return response.data
+
+def save_games_to_database(events):
+    """Save or update all games and their results with bulk upserts on event_uid"""
+    last_updated = datetime.now(timezone.utc).isoformat()
+    # Keyed by uid so repeated UIDs (e.g. recurrence overrides) keep only the last row;
+    # one upsert cannot touch the same row twice
+    games_by_uid = {}
+    for event in events:
         # Extract game details
         game_data = {
             "event_uid": event.uid,
             "name": event.name,
-            "start_time": event.begin.datetime.isoformat(),
+            "start_time": event.begin_dt.isoformat(),
             "location": event.location if event.location else "",
             "opponent": event.name.split("vs")[1].strip() if "vs" in event.name else "",
-            "last_updated": datetime.now(timezone.utc).isoformat()
-        }
-        
-        # Check if game exists
-        response = supabase.table("games").select("event_uid").eq("event_uid", event.uid).execute()
-        
-        if not response.data:
-            # New game, insert it
-            supabase.table("games").insert(game_data).execute()
-        else:
-            # Existing game, update it
-            supabase.table("games").update(game_data).eq("event_uid", event.uid).execute()
-            
-    except Exception as e:
-        st.error(f"Error saving game: {str(e)}")
-
-def update_game_result(event_uid, result_type, score):
-    """Update game result in the database"""
-    try:
-        game_data = {
-            "result": result_type,  # "W" or "L"
-            "score": score,
-            "last_updated": datetime.now(timezone.utc).isoformat()
+            "last_updated": last_updated
         }
-        supabase.table("games").update(game_data).eq("event_uid", event_uid).execute()
-    except Exception as e:
-        st.error(f"Error updating game result: {str(e)}")
-
-def save_game_to_database(event):
-    """Save or update a single game and its result in the database"""
-    try:
-        # Save basic game info
-        save_or_update_game(event)
         
-        # Check for and save game result if available
+        # Attach the game result if the name carries one
         result = parse_game_result(event.name)
         if result:
-            result_type = "W" if "Win" in result else "L"
-            score = result.split(" ")[1] if len(result.split(" ")) > 1 else ""
-            update_game_result(event.uid, result_type, score)
-            
+            outcome, score = result.split(" ", 1)
+            game_data["result"] = "W" if outcome == "Win" else "L"
+            game_data["score"] = score
+        games_by_uid[event.uid] = game_data
+    
+    games = [game for game in games_by_uid.values() if "result" not in game]
+    games_with_results = [game for game in games_by_uid.values() if "result" in game]
+    
+    try:
+        # Rows in one upsert must share columns, so games without a result
+        # go separately and keep whatever result is already stored
+        for rows in (games, games_with_results):
+            if rows:
+                supabase.table("games").upsert(rows, on_conflict="event_uid").execute()
+        load_all_games.clear()
         return True
     except Exception as e:
-        st.error(f"Error saving game {event.name} to database: {str(e)}")
+        st.error(f"Error saving games to database: {str(e)}")
         return False
 
 # --- CALENDAR CACHE SETTINGS ---
-CACHE_FILE = "calendar_cache.json"
+CACHE_FILE = "calendar_cache.ics.gz"  # gzipped raw iCal text; file mtime is the timestamp
+CACHE_META_FILE = "calendar_cache.meta.json"  # ETag/Last-Modified of the cached body
 CACHE_DURATION = 12 * 3600  # 12 hours in seconds
 
 # --- CALENDAR FETCH SETTINGS ---
 FETCH_TIMEOUT = 30
+HTTP_POOL_SIZE = 20  # Room for concurrent calendar, weather and geocoding requests
+LOOKUP_TIMEOUT = 10  # Weather/geocoding requests made while a page renders
 RETRY_STRATEGY = Retry(
     total=5,
     backoff_factor=1,
     status_forcelist=[429, 500, 502, 503, 504],
 )
-adapter = HTTPAdapter(max_retries=RETRY_STRATEGY)
-http = requests.Session()
-http.mount("https://", adapter)
-http.mount("http://", adapter)
 
-# Disable insecure request warnings
-urllib3.disable_warnings()
+@st.cache_resource(show_spinner=False)
+def get_http_session():
+    """Create the retrying HTTP session once per process so its connection pool stays warm."""
+    adapter = HTTPAdapter(
+        max_retries=RETRY_STRATEGY,
+        pool_connections=HTTP_POOL_SIZE,
+        pool_maxsize=HTTP_POOL_SIZE
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+@st.cache_resource(show_spinner=False)
+def get_lookup_session():
+    """Pooled session for the weather and geocoding lookups made while a page renders.
+    No retries or Retry-After waits: a failed lookup just shows no forecast, rather than
+    stalling every rerun behind the calendar fetch's backoff."""
+    adapter = HTTPAdapter(
+        max_retries=0,
+        pool_connections=HTTP_POOL_SIZE,
+        pool_maxsize=HTTP_POOL_SIZE
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+http = get_http_session()
+lookup_http = get_lookup_session()
 
+@lru_cache(maxsize=1024)
 def clean_game_name(name):
     """Remove 'Soccerdome (Webster Groves) on ' and return cleaned name."""
     prefix = "Soccerdome (Webster Groves) on "
@@ -322,6 +405,9 @@ def clean_game_name(name):
         return name[len(prefix):]  # Cut the prefix
     return name
 
+FIELD_TRAILING_ONE_RE = re.compile(r'([A-Z])\s*1$')
+
+@lru_cache(maxsize=1024)
 def clean_location(location):
     """Smart clean: separate field and address properly."""
     prefix = "Soccerdome (Webster Groves) on "
@@ -335,7 +421,7 @@ def clean_location(location):
     if idx != -1:
         field = location[:idx].strip("- ").strip()
         # Remove trailing "1" after field letter (e.g., "A 1" -> "A")
-        field = re.sub(r'([A-Z])\s*1$', r'\1', field)
+        field = FIELD_TRAILING_ONE_RE.sub(r'\1', field)
         address = location[idx-2:].strip()  # take two characters before for "1 " in "1 Soccer Park Rd"
         return field, address
     else:
@@ -343,83 +429,221 @@ def clean_location(location):
         return location.strip(), None
 
 # Define parse_game_result locally to avoid import issues
+GAME_RESULT_RE = re.compile(r"\b([WL])\s*(\d+)\s*-\s*(\d+).*?vs")
+
+@lru_cache(maxsize=1024)
 def parse_game_result(event_name):
     """Parse the game result from the event name if available"""
-    if "L" in event_name and "vs" in event_name:
-        try:
-            # Extract score like "L 3-5"
-            result_part = event_name.split("vs")[0]
-            if "L" in result_part:
-                score = result_part.split("L")[1].strip()
-                return f"Loss {score}"
-        except:
-            pass
-    elif "W" in event_name and "vs" in event_name:
-        try:
-            # Extract score like "W 3-5"
-            result_part = event_name.split("vs")[0]
-            if "W" in result_part:
-                score = result_part.split("W")[1].strip()
-                return f"Win {score}"
-        except:
-            pass
+    # Extract a standalone result like "L 3-5" that precedes "vs"
+    match = GAME_RESULT_RE.search(event_name)
+    if match:
+        outcome, goals_for, goals_against = match.groups()
+        return f"{'Win' if outcome == 'W' else 'Loss'} {goals_for}-{goals_against}"
     return None
 
-@st.cache_data(ttl=300)  # 5 minute TTL for parsed events
+@dataclass(frozen=True, slots=True)
+class GameEvent:
+    """Calendar event with its start time fields extracted once at parse time"""
+    uid: str
+    name: str
+    location: str
+    begin_dt: datetime
+    begin_date: date
+    begin_time: str  # Display time, e.g. "7:30 PM"
+
+# --- ICAL PARSING ---
+# Only the VEVENT properties the app uses are extracted; everything else is skipped
+ICAL_FOLD_RE = re.compile(r"\r?\n[ \t]")
+ICAL_PROPERTY_RE = re.compile(r"^(UID|SUMMARY|LOCATION|DTSTART)((?:;[^:]*)?):(.*)$", re.IGNORECASE)
+ICAL_TEXT_ESCAPE_RE = re.compile(r"\\([\\;,nN])")
+ICAL_VTIMEZONE_RE = re.compile(r"^BEGIN:VTIMEZONE$.*?^END:VTIMEZONE$", re.IGNORECASE | re.MULTILINE | re.DOTALL)
+
+def unescape_ical_text(value):
+    """Undo iCal TEXT escaping of backslashes, semicolons, commas and newlines"""
+    return ICAL_TEXT_ESCAPE_RE.sub(lambda m: "\n" if m.group(1) in "nN" else m.group(1), value)
+
+def load_ical_timezones(calendar_data):
+    """Map each TZID defined by a VTIMEZONE block in the feed to its tzinfo.
+    Blocks are parsed one at a time, so a malformed one only loses its own zone."""
+    timezones = {}
+    unfolded = ICAL_FOLD_RE.sub("", calendar_data).replace("\r\n", "\n")
+    for block in ICAL_VTIMEZONE_RE.findall(unfolded):
+        try:
+            zones = dateutil_tz.tzical(io.StringIO(block))
+            timezones.update((tzid, zones.get(tzid)) for tzid in zones.keys())
+        except Exception:
+            continue
+    return timezones
+
+def parse_ical_datetime(params, value, timezones):
+    """Convert a DTSTART value to an aware datetime.
+    TZID values use the feed's own VTIMEZONE definition, else the system zone of that name.
+    A TZID neither resolves is recorded in timezones as None and read as UTC;
+    UTC, floating and all-day values use UTC."""
+    if "T" not in value:  # All-day DATE value
+        return datetime.strptime(value[:8], "%Y%m%d").replace(tzinfo=timezone.utc)
+    begin = datetime.strptime(value[:15], "%Y%m%dT%H%M%S")
+    zone = None
+    if not value.endswith("Z"):
+        for param in params.split(";"):
+            key, _, param_value = param.partition("=")
+            if key.upper() == "TZID":
+                tzid = param_value.strip('"')
+                if tzid not in timezones:
+                    timezones[tzid] = dateutil_tz.gettz(tzid)
+                zone = timezones[tzid]
+    return begin.replace(tzinfo=zone or timezone.utc)
+
+def format_game_time(begin):
+    """Format a start time for display, e.g. "7:30 PM" """
+    return f"{begin.hour % 12 or 12}:{begin.minute:02d} {'AM' if begin.hour < 12 else 'PM'}"
+
+def iter_vevents(calendar_data):
+    """Yield {property: (params, value)} for each VEVENT, ignoring nested components like VALARM"""
+    event = None
+    depth = 0
+    for line in ICAL_FOLD_RE.sub("", calendar_data).splitlines():
+        upper = line.upper()
+        if event is None:
+            if upper == "BEGIN:VEVENT":
+                event = {}
+                depth = 0
+        elif upper.startswith("BEGIN:"):
+            depth += 1
+        elif upper.startswith("END:"):
+            if depth:
+                depth -= 1
+            else:
+                yield event
+                event = None
+        elif not depth:
+            match = ICAL_PROPERTY_RE.match(line)
+            if match:
+                name, params, value = match.groups()
+                event[name.upper()] = (params.lstrip(";"), value)
+
+def calendar_hash(calendar_data):
+    """Cheap content digest of the raw calendar text, used as the parse cache key"""
+    return hashlib.blake2b(calendar_data.encode(), digest_size=8).hexdigest()
+
+@st.cache_resource(ttl=CACHE_DURATION * 2, show_spinner=False)
+def parse_calendar_events_by_hash(body_hash, _calendar_data):
+    """Parse calendar data into events, cached on body_hash (the underscore
+    argument is excluded from Streamlit's hashing of the large raw text).
+    The frozen GameEvents are shared read-only, so cache_resource skips the pickle round-trip.
+    Events come back sorted by date and start time, so reruns never re-sort them."""
+    events = []
+    timezones = load_ical_timezones(_calendar_data)
+    for props in iter_vevents(_calendar_data):
+        if "DTSTART" not in props:
+            continue
+        begin = parse_ical_datetime(*props["DTSTART"], timezones)
+        summary = props.get("SUMMARY")
+        location = props.get("LOCATION")
+        events.append(GameEvent(
+            uid=props["UID"][1] if "UID" in props else f"{uuid.uuid4()}@stlcity3",
+            name=unescape_ical_text(summary[1]) if summary else None,
+            location=unescape_ical_text(location[1]) if location else None,
+            begin_dt=begin,
+            begin_date=begin.date(),
+            begin_time=format_game_time(begin)
+        ))
+    events.sort(key=attrgetter('begin_date', 'begin_dt'))
+    
+    unknown_zones = sorted(tzid for tzid, zone in timezones.items() if zone is None)
+    if unknown_zones:
+        st.warning(f"Unknown calendar time zone(s) {', '.join(unknown_zones)}; those game times are shown as UTC")
+    return events
+
 def parse_calendar_events(calendar_data):
     """Parse calendar data into events (cached separately from raw data)"""
     if not calendar_data:
         return []
-    cal = Calendar(calendar_data)
-    return list(cal.events)
+    return parse_calendar_events_by_hash(calendar_hash(calendar_data), calendar_data)
 
 def fetch_calendar_sync(url):
-    """Fetch calendar data synchronously with retries"""
+    """Fetch calendar data synchronously with retries.
+    Revalidates against the cached copy, so an unchanged feed returns the cache without a body transfer."""
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+        'Accept': 'text/calendar,*/*'
+    }
+    cached_data, _ = load_calendar_cache()
+    if cached_data:
+        meta = load_calendar_cache_meta()
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
     try:
-        response = http.get(
-            url,
-            timeout=FETCH_TIMEOUT,
-            headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                'Accept': 'text/calendar,*/*'
-            },
-            verify=False  # Disable SSL verification for problematic servers
-        )
+        response = http.get(url, timeout=FETCH_TIMEOUT, headers=headers)
+        if response.status_code == 304:
+            return cached_data
         response.raise_for_status()
+        save_calendar_cache_meta({
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')
+        })
         return response.text
     except requests.exceptions.RequestException as e:
         raise Exception(f"Failed to fetch calendar: {str(e)}")
 
-@st.cache_data(ttl=CACHE_DURATION, show_spinner=False)
+def refresh_calendar(url):
+    """Fetch the feed, update the cache file and save all events to the database"""
+    calendar_data = fetch_calendar_sync(url)
+    if not calendar_data:
+        return []
+    save_calendar_cache(calendar_data)
+    events = parse_calendar_events(calendar_data)
+    # Skip the database write when the feed content matches the last saved copy
+    body_hash = calendar_hash(calendar_data)
+    if load_calendar_cache_meta().get('saved_hash') != body_hash:
+        if save_games_to_database(events):
+            save_calendar_cache_meta({'saved_hash': body_hash})
+    return events
+
+@st.cache_resource
+def get_calendar_refresh_lock():
+    """Process-wide lock so at most one background calendar refresh runs at a time"""
+    return threading.Lock()
+
+def refresh_calendar_in_background(url, lock):
+    """Thread target: refresh the calendar, then drop the cached events so the next run picks it up"""
+    try:
+        refresh_calendar(url)
+        get_calendar_events.clear()
+    except Exception:
+        pass  # Keep serving the stale cache; the next stale read retries
+    finally:
+        lock.release()
+
+def calendar_cache_age():
+    """Seconds since the calendar cache was written, or None if there is no cache"""
+    try:
+        return time.time() - os.path.getmtime(CACHE_FILE)
+    except OSError:
+        return None
+
+@st.cache_resource(ttl=300, show_spinner=False)
 def get_calendar_events(url):
-    """Fetch calendar events and save to database"""
+    """Return calendar events, serving the cache file immediately when one exists.
+    A stale cache is refreshed in a background thread; only a missing cache blocks on the fetch."""
+    cached_data, _ = load_calendar_cache()
+    if cached_data:
+        cache_age = calendar_cache_age()
+        if cache_age is None or cache_age > CACHE_DURATION:
+            lock = get_calendar_refresh_lock()
+            if lock.acquire(blocking=False):
+                threading.Thread(
+                    target=refresh_calendar_in_background, args=(url, lock), daemon=True
+                ).start()
+        return parse_calendar_events(cached_data)
+    
     try:
-        # Try to fetch new data
-        calendar_data = fetch_calendar_sync(url)
-        if calendar_data:
-            # Save to cache file for backup
-            save_calendar_cache(calendar_data)
-            events = parse_calendar_events(calendar_data)
-            
-            # Save all events to database
-            for event in events:
-                save_game_to_database(event)
-            
-            return events
+        # No cache yet, so the first load has to wait for the feed
+        return refresh_calendar(url)
     except Exception as e:
         st.error(f"Failed to fetch fresh calendar data: {str(e)}")
-        
-        # Try to load from cache
-        cached_data, _ = load_calendar_cache()
-        if cached_data:
-            st.warning("Using cached data while server is unavailable")
-            events = parse_calendar_events(cached_data)
-            # Even with cached data, ensure games are saved to database
-            for event in events:
-                save_game_to_database(event)
-            return events
-        
-        # If everything fails, return empty list
         return []
 
 def get_calendar_events_no_cache(url):
@@ -431,8 +655,7 @@ def get_calendar_events_no_cache(url):
             events = parse_calendar_events(calendar_data)
             
             # Save all events to database
-            for event in events:
-                save_game_to_database(event)
+            save_games_to_database(events)
             
             return events
     except Exception as e:
@@ -442,8 +665,7 @@ def get_calendar_events_no_cache(url):
             st.warning("Using cached data while server is unavailable")
             events = parse_calendar_events(cached_data)
             # Even with cached data, ensure games are saved to database
-            for event in events:
-                save_game_to_database(event)
+            save_games_to_database(events)
             return events
     return []
 
@@ -451,49 +673,85 @@ def load_calendar_cache():
     """Load cached calendar data"""
     try:
         if os.path.exists(CACHE_FILE):
-            with open(CACHE_FILE, 'r') as f:
-                cache = json.load(f)
-                return cache['data'], True
+            with gzip.open(CACHE_FILE, 'rt', encoding='utf-8') as f:
+                return f.read(), True
     except Exception as e:
         st.warning(f"Cache read error: {str(e)}")
     return None, False
 
 def save_calendar_cache(data):
-    """Save calendar data to cache file"""
+    """Save calendar data to cache file.
+    Writes to a temp file and renames it into place, so readers never see a partial file."""
     try:
-        cache = {
-            'timestamp': time.time(),
-            'data': data
-        }
-        with open(CACHE_FILE, 'w') as f:
-            json.dump(cache, f)
+        tmp_file = CACHE_FILE + ".tmp"
+        with gzip.open(tmp_file, 'wt', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_file, CACHE_FILE)
     except Exception as e:
         st.warning(f"Cache write error: {str(e)}")
 
+def load_calendar_cache_meta():
+    """Load the HTTP validators saved alongside the calendar cache"""
+    try:
+        if os.path.exists(CACHE_META_FILE):
+            with open(CACHE_META_FILE, 'r') as f:
+                return json.load(f)
+    except Exception as e:
+        st.warning(f"Cache metadata read error: {str(e)}")
+    return {}
+
+def save_calendar_cache_meta(updates):
+    """Merge updates (HTTP validators, last saved content hash) into the calendar cache metadata"""
+    try:
+        meta = load_calendar_cache_meta()
+        meta.update(updates)
+        tmp_file = CACHE_META_FILE + ".tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_file, CACHE_META_FILE)
+    except Exception as e:
+        st.warning(f"Cache metadata write error: {str(e)}")
+
 # --- DATABASE VERIFICATION ---
-def verify_database_setup():
-    """Verify that the required tables exist"""
+# Required tables and a column to probe each one with
+REQUIRED_TABLES = (("users", "id"), ("rsvps", "id"), ("games", "event_uid"))
+DATABASE_CHECK_TTL = 3600  # Re-probe the tables at most hourly per process
+
+@st.cache_resource
+def get_database_check():
+    """Process-wide record of when the table probes last passed"""
+    return {'verified_at': 0.0}
+
+def start_database_probes(executor):
+    """Start a one-row select against every required table on the executor,
+    or nothing if the tables were verified within DATABASE_CHECK_TTL"""
+    if time.time() - get_database_check()['verified_at'] < DATABASE_CHECK_TTL:
+        return []
+    return [
+        executor.submit(lambda table=table, column=column: supabase.table(table).select(column).limit(1).execute())
+        for table, column in REQUIRED_TABLES
+    ]
+
+def verify_database_setup(probes):
+    """Verify that the required tables exist by waiting on the table probes"""
     try:
-        # Check if tables exist by trying to select from them
-        supabase.table("users").select("id").limit(1).execute()
-        supabase.table("rsvps").select("id").limit(1).execute()
-        
-        # Create games table if it doesn't exist
-        supabase.table("games").select("event_uid").limit(1).execute()
-        
+        for probe in probes:
+            probe.result()
+        if probes:
+            get_database_check()['verified_at'] = time.time()
         return True
     except Exception as e:
         st.error(f"Database verification failed: {str(e)}")
         st.error("Please make sure all required tables are created in Supabase")
         return False
 
-# Verify database setup
-if not verify_database_setup():
-    st.stop()
-
-# Now fetch calendar events after database is ready
+# Verify database setup while the calendar loads, so startup waits for the slower of the two
 ical_url = "https://sportsix.sports-it.com/ical/?cid=vetta&id=530739&k=eb6b76bb92bc6e66bdb4cac8357cc495"
-events = get_calendar_events(ical_url)  # ✅ Cached version!
+with ThreadPoolExecutor(max_workers=len(REQUIRED_TABLES)) as startup_pool:
+    database_probes = start_database_probes(startup_pool)
+    events = get_calendar_events(ical_url)  # ✅ Cached version!
+if not verify_database_setup(database_probes):
+    st.stop()
 
 # --- HELPER FUNCTIONS ---
 
@@ -501,63 +759,76 @@ events = get_calendar_events(ical_url)  # ✅ Cached version!
 def get_all_games():
     """Get all games from the database"""
     try:
-        response = supabase.table("games").select("*").order("start_time").execute()
-        return response.data
+        return load_all_games()
     except Exception as e:
         st.error(f"Error getting games: {str(e)}")
         return []
 
+# --- RSVP CACHE INVALIDATION ---
+@st.cache_resource
+def get_rsvp_version_counter():
+    """Process-wide counter bumped on every RSVP write (shared by all sessions).
+    Session threads bump it concurrently, so increments go through its lock."""
+    return {'value': 0, 'lock': threading.Lock()}
+
+def get_rsvp_version():
+    """Return the current RSVP data version, used as a cache key for reads."""
+    return get_rsvp_version_counter()['value']
+
+def bump_rsvp_version():
+    """Invalidate cached RSVP reads after a write."""
+    counter = get_rsvp_version_counter()
+    with counter['lock']:
+        counter['value'] += 1
+
 # --- DATABASE HELPER FUNCTIONS ---
 def get_or_create_user(name):
-    """Get user id for given name; if not found, create the user."""
+    """Get user id for given name; if not found, create the user.
+    The id is remembered in session state, so repeat calls skip the lookup."""
+    name = name.lower()
+    cache_key = f"user_id_{name}"
+    if st.session_state.get(cache_key):
+        return st.session_state[cache_key]
     try:
         # Try to find existing user
-        response = supabase.table("users").select("id").eq("name", name.lower()).execute()
-        if response.data:
-            return response.data[0]['id']
+        response = supabase.table("users").select("id").eq("name", name).execute()
+        if not response.data:
+            # Create new user if not found
+            response = supabase.table("users").insert({"name": name}).execute()
         
-        # Create new user if not found
-        response = supabase.table("users").insert({"name": name.lower()}).execute()
-        return response.data[0]['id']
+        st.session_state[cache_key] = response.data[0]['id']
+        return st.session_state[cache_key]
     except Exception as e:
         st.error(f"Error in get_or_create_user: {str(e)}")
         return None
 
 def add_rsvp(user_id, event_uid, participation, timestamp):
-    """Insert a new RSVP record."""
+    """Insert an RSVP record, or update the user's existing one for this event."""
     try:
-        # First, delete any existing RSVP for this user and event
-        supabase.table("rsvps").delete().eq("user_id", user_id).eq("event_uid", event_uid).execute()
-        
-        # Then add the new RSVP
-        supabase.table("rsvps").insert({
+        # Single upsert against the unique (user_id, event_uid) index
+        supabase.table("rsvps").upsert({
             "user_id": user_id,
             "event_uid": event_uid,
             "participation": participation,
             "timestamp": timestamp
-        }).execute()
+        }, on_conflict="user_id,event_uid").execute()
+        bump_rsvp_version()
     except Exception as e:
         st.error(f"Error adding RSVP: {str(e)}")
 
 def get_rsvp_counts(event_uid):
     """Return counts of 'In' and 'Out' RSVPs for a given event."""
-    try:
-        in_response = supabase.table("rsvps").select("id").eq("event_uid", event_uid).eq("participation", "In").execute()
-        out_response = supabase.table("rsvps").select("id").eq("event_uid", event_uid).eq("participation", "Out").execute()
-        return len(in_response.data), len(out_response.data)
-    except Exception as e:
-        st.error(f"Error getting RSVP counts: {str(e)}")
-        return 0, 0
+    return get_rsvp_counts_bulk([event_uid])[event_uid]
 
-def get_all_rsvps():
-    """Return all RSVP records joined with user names."""
+def get_user_rsvps(user_name):
+    """Return one user's RSVP records (user names are stored lowercase)."""
     try:
-        # Use foreign key expansion with proper Supabase syntax
+        # Filter on the embedded user so only this user's rows are returned
         response = supabase.table("rsvps").select(
-            "id, event_uid, participation, timestamp, users:user_id(name)"
-        ).execute()
+            "id, event_uid, participation, timestamp, users:user_id!inner(name)"
+        ).eq("users.name", user_name.lower()).execute()
         
-        # Transform the response to match the expected format
+        # Flatten the embedded user name into each RSVP record
         transformed_data = []
         for item in response.data:
             transformed_data.append({
@@ -569,52 +840,100 @@ def get_all_rsvps():
             })
         return transformed_data
     except Exception as e:
-        st.error(f"Error getting all RSVPs: {str(e)}")
+        st.error(f"Error getting your RSVPs: {str(e)}")
         return []
 
 def delete_rsvp(rsvp_id):
     """Delete a specific RSVP by its id."""
     try:
         supabase.table("rsvps").delete().eq("id", rsvp_id).execute()
+        bump_rsvp_version()
     except Exception as e:
         st.error(f"Error deleting RSVP: {str(e)}")
 
+def delete_rsvps(rsvp_ids):
+    """Delete several RSVPs by id in one request."""
+    if not rsvp_ids:
+        return
+    try:
+        supabase.table("rsvps").delete().in_("id", list(rsvp_ids)).execute()
+        bump_rsvp_version()
+    except Exception as e:
+        st.error(f"Error deleting RSVPs: {str(e)}")
+
 def get_user_rsvp_for_event(user_name, event_uid):
     """Get a user's RSVP status for a specific event."""
     try:
-        # First get the user ID
-        user_response = supabase.table("users").select("id").eq("name", user_name.lower()).execute()
-        if not user_response.data:
-            return None
-            
-        user_id = user_response.data[0]['id']
-        
-        # Then get the RSVP
-        response = supabase.table("rsvps").select("id, participation").eq("user_id", user_id).eq("event_uid", event_uid).execute()
+        # Filter on the embedded user name so the lookup is a single request
+        response = supabase.table("rsvps").select(USER_RSVP_COLUMNS).eq(
+            "users.name", user_name.lower()
+        ).eq("event_uid", event_uid).execute()
         return response.data[0] if response.data else None
     except Exception as e:
         st.error(f"Error getting user RSVP: {str(e)}")
         return None
 
-def get_rsvp_list(event_uid):
-    """Get list of users who RSVP'd for an event."""
+RSVP_UID_CHUNK = 50  # Event uids per request
+RSVP_PAGE_SIZE = 1000  # Rows per page; PostgREST's default max-rows
+
+@st.cache_data(ttl=60, show_spinner=False, max_entries=256)
+def fetch_rsvp_rows(event_uids, rsvp_version):
+    """Fetch RSVP rows for several events.
+    rsvp_version is only part of the cache key, so a write in this process invalidates at once;
+    the TTL bounds staleness from writes this process never sees (other replicas, the dashboard).
+    Event uids go out in chunks to keep the GET URL short, and each chunk is paged with
+    .range() until its exact row count is reached, so PostgREST's row cap never truncates it."""
+    rows = []
+    for chunk_start in range(0, len(event_uids), RSVP_UID_CHUNK):
+        uid_chunk = list(event_uids[chunk_start:chunk_start + RSVP_UID_CHUNK])
+        offset = 0
+        while True:
+            response = supabase.table("rsvps").select(RSVP_ROW_COLUMNS, count="exact").in_(
+                "event_uid", uid_chunk
+            ).order("timestamp").order("id").range(offset, offset + RSVP_PAGE_SIZE - 1).execute()
+            rows.extend(response.data)
+            offset += len(response.data)
+            if not response.data or offset >= (response.count or 0):
+                break
+    return rows
+
+def get_rsvp_counts_bulk(event_uids):
+    """Return {event_uid: (in_count, out_count)} for several events in one query."""
+    counts = {uid: (0, 0) for uid in event_uids}
+    if not counts:
+        return counts
     try:
-        # Use foreign key expansion with proper Supabase syntax
-        response = supabase.table("rsvps").select(
-            "users:user_id(name), participation"
-        ).eq("event_uid", event_uid).order("timestamp").execute()
+        rows = fetch_rsvp_rows(tuple(counts), get_rsvp_version())
         
-        # Transform the response to match the expected format
-        transformed_data = []
-        for item in response.data:
-            transformed_data.append({
-                'name': item['users']['name'],
-                'participation': item['participation']
-            })
-        return transformed_data
+        tallies = {uid: [0, 0] for uid in counts}
+        for item in rows:
+            if item['participation'] == "In":
+                tallies[item['event_uid']][0] += 1
+            elif item['participation'] == "Out":
+                tallies[item['event_uid']][1] += 1
+        return {uid: tuple(tally) for uid, tally in tallies.items()}
     except Exception as e:
-        st.error(f"Error getting RSVP list: {str(e)}")
-        return []
+        st.error(f"Error getting RSVP counts: {str(e)}")
+        return counts
+
+def get_rsvp_rosters_bulk(event_uids):
+    """Return {event_uid: (in_names, out_names)} as sorted, comma-joined strings,
+    built in one pass over the RSVP rows for all given events."""
+    names = {uid: ([], []) for uid in event_uids}
+    if names:
+        try:
+            rows = fetch_rsvp_rows(tuple(names), get_rsvp_version())
+            for item in rows:
+                if item['participation'] == "In":
+                    names[item['event_uid']][0].append(item['users']['name'])
+                elif item['participation'] == "Out":
+                    names[item['event_uid']][1].append(item['users']['name'])
+        except Exception as e:
+            st.error(f"Error getting RSVP list: {str(e)}")
+    return {
+        uid: (", ".join(sorted(in_names)), ", ".join(sorted(out_names)))
+        for uid, (in_names, out_names) in names.items()
+    }
 
 # --- STATISTICS FUNCTIONS ---
 def determine_seasons(games):
@@ -624,40 +943,21 @@ def determine_seasons(games):
         return []
     
     # Sort games by start time
-    sorted_games = sorted(games, key=lambda g: g['start_time'])
-    
-    seasons = []
-    current_season = [sorted_games[0]]
-    
-    for i in range(1, len(sorted_games)):
-        current_game = sorted_games[i]
-        last_game = sorted_games[i-1]
-        
-        # Convert ISO strings to datetime objects
-        current_date = datetime.fromisoformat(current_game['start_time'])
-        last_date = datetime.fromisoformat(last_game['start_time'])
-        
-        # Calculate days between games
-        gap = (current_date - last_date).days
-        
-        if gap >= 20:  # If gap is 20 days or more, start new season
-            seasons.append(current_season)
-            current_season = [current_game]
-        else:
-            current_season.append(current_game)
+    sorted_games = sorted(games, key=itemgetter('_start_dt'))
     
-    # Add the last season
-    if current_season:
-        seasons.append(current_season)
+    # Reuse the start times parsed in load_all_games and find where the gap to the previous game is 20+ days
+    starts = pd.to_datetime(pd.Series([g['_start_dt'] for g in sorted_games]), utc=True)
+    season_starts = (starts.diff().dt.days >= 20).to_numpy().nonzero()[0].tolist()
     
-    return seasons
+    # Slice the sorted games at each season boundary
+    bounds = [0] + season_starts + [len(sorted_games)]
+    return [sorted_games[start:end] for start, end in zip(bounds, bounds[1:])]
 
 def get_season_stats():
     """Get overall season statistics"""
     try:
         # Get all games with results
-        response = supabase.table("games").select("*").order("start_time").execute()
-        all_games = response.data
+        all_games = load_all_games()
         
         if not all_games:
             return None
@@ -665,47 +965,54 @@ def get_season_stats():
         # Split games into seasons
         seasons = determine_seasons(all_games)
         
+        # Tag every game with its season so the tallies below run as one groupby
+        games_df = pd.DataFrame(all_games)
+        games_df['season'] = [
+            season_number
+            for season_number, season_games in enumerate(seasons, 1)
+            for _ in season_games
+        ]
+        
+        # Get season date ranges (ISO timestamps, so the date is the first 10 chars)
+        dates = games_df['start_time'].str[:10].groupby(games_df['season']).agg(['first', 'last'])
+        
+        results = games_df[games_df['result'].fillna('').astype(bool)]
+        if results.empty:
+            return []
+        
+        # Parse scores to get goals for/against; malformed scores count as no goals
+        goals = results['score'].str.extract(r'^(\d+)-(\d+)$').astype(float)
+        tallies = pd.DataFrame({
+            'season': results['season'],
+            'wins': results['result'].eq('W'),
+            'losses': results['result'].eq('L'),
+            'goals_for': goals[0],
+            'goals_against': goals[1],
+        }).groupby('season').agg(
+            total_games=('wins', 'size'),
+            wins=('wins', 'sum'),
+            losses=('losses', 'sum'),
+            goals_for=('goals_for', 'sum'),
+            goals_against=('goals_against', 'sum'),
+        )
+        
         season_stats = []
-        for season_number, season_games in enumerate(seasons, 1):
-            games_with_results = [g for g in season_games if g['result']]
-            
-            if not games_with_results:
-                continue
-                
-            total_games = len(games_with_results)
-            wins = len([g for g in games_with_results if g['result'] == 'W'])
-            losses = len([g for g in games_with_results if g['result'] == 'L'])
-            
-            # Calculate win percentage
-            win_pct = (wins / total_games) * 100 if total_games > 0 else 0
-            
-            # Parse scores to get goals for/against
-            goals_for = 0
-            goals_against = 0
-            for game in games_with_results:
-                if game['score']:
-                    try:
-                        our_score, their_score = map(int, game['score'].split('-'))
-                        goals_for += our_score
-                        goals_against += their_score
-                    except:
-                        continue
-            
-            # Get season date range
-            season_start = datetime.fromisoformat(season_games[0]['start_time']).strftime('%Y-%m-%d')
-            season_end = datetime.fromisoformat(season_games[-1]['start_time']).strftime('%Y-%m-%d')
-            
+        for season_number, row in tallies.iterrows():
+            total_games = int(row['total_games'])
+            wins = int(row['wins'])
+            goals_for = int(row['goals_for'])
+            goals_against = int(row['goals_against'])
             season_stats.append({
                 'season_number': season_number,
-                'date_range': f"{season_start} to {season_end}",
+                'date_range': f"{dates.at[season_number, 'first']} to {dates.at[season_number, 'last']}",
                 'total_games': total_games,
                 'wins': wins,
-                'losses': losses,
-                'win_pct': win_pct,
+                'losses': int(row['losses']),
+                'win_pct': (wins / total_games) * 100,
                 'goals_for': goals_for,
                 'goals_against': goals_against,
                 'goal_diff': goals_for - goals_against,
-                'games': games_with_results
+                'games': [g for g in seasons[season_number - 1] if g['result']]
             })
         
         return season_stats
@@ -830,50 +1137,45 @@ def display_season_stats():
                     st.dataframe(df.set_index('Date'), use_container_width=True)
 
 # --- DISPLAY FUNCTIONS ---
+WEEKDAY_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
 def display_attendance_status(in_count):
     """Display attendance status with clear thresholds and alerts"""
-    cols = st.columns([3, 1])
-    
-    with cols[0]:
-        if in_count < 8:
-            st.error(f"🚨 EMERGENCY: Only {in_count}/8 players!")
-            progress = in_count / 8
-            st.markdown(f"**Need {8 - in_count} more players to start the game!**")
-        elif in_count < 12:
-            st.warning(f"⚠️ Have {in_count}/12 players")
-            progress = (in_count - 8) / (12 - 8)  # Progress from 8 to 12
-            st.markdown(f"**Need {12 - in_count} more players for ideal subs**")
-        else:
-            st.success(f"✅ Perfect! {in_count} players (including subs)")
-            progress = 1.0
+    if in_count < 8:
+        st.error(f"🚨 EMERGENCY: Only {in_count}/8 players!")
+        progress, bar_class = in_count / 8, 'p-red'
+        need, stage = f"Need {8 - in_count} more players to start the game!", "🏃 Progress to minimum:"
+    elif in_count < 12:
+        st.warning(f"⚠️ Have {in_count}/12 players")
+        progress, bar_class = (in_count - 8) / (12 - 8), 'p-amber'  # Progress from 8 to 12
+        need, stage = f"Need {12 - in_count} more players for ideal subs", "🔄 Progress to ideal:"
+    else:
+        st.success(f"✅ Perfect! {in_count} players (including subs)")
+        progress, bar_class = 1.0, 'p-green'
+        need, stage = "", "🌟 Full roster!"
     
-    with cols[1]:
-        if in_count < 8:
-            st.markdown("🏃 Progress to minimum:")
-        elif in_count < 12:
-            st.markdown("🔄 Progress to ideal:")
-        else:
-            st.markdown("🌟 Full roster!")
-        
-    # Show progress bar with custom styling
+    # Need/progress labels, the bar (page-level attendance classes) and the divider in one element
     st.markdown(
-        f"""
-        <style>
-        .stProgress > div > div > div > div {{
-            {'background-color: #ff4b4b' if in_count < 8 else 'background-color: #faa' if in_count < 12 else 'background-color: #4bb543'} 
-        }}
-        </style>
-        """,
+        f'<div class="attendance-status"><strong>{need}</strong><span>{stage}</span></div>'
+        f'<div class="attendance-bar"><div class="{bar_class}" style="width: {progress:.0%}"></div></div>'
+        '<hr>',
         unsafe_allow_html=True
     )
-    st.progress(progress)
-    
-    # Add spacing after the progress bar
-    st.markdown("---")
 
-def handle_rsvp_buttons(event_uid, user_name, btn_key_prefix=""):
-    """Handle RSVP button interactions with toggle functionality"""
-    user_rsvp = get_user_rsvp_for_event(user_name, event_uid)
+def toggle_rsvp(event_uid, user_name, participation, user_rsvp):
+    """Button callback: set the user's RSVP, or remove it if it already matches.
+    Runs before the next script run, so no explicit st.rerun() is needed."""
+    if user_rsvp and user_rsvp['participation'] == participation:
+        # If already set to this status, remove the RSVP
+        delete_rsvp(user_rsvp['id'])
+    else:
+        # Set the new status (updates any existing RSVP in place)
+        user_id = get_or_create_user(user_name)
+        add_rsvp(user_id, event_uid, participation, datetime.now(timezone.utc).isoformat(timespec='seconds'))
+
+def handle_rsvp_buttons(event_uid, user_name, user_rsvp, btn_key_prefix=""):
+    """Handle RSVP button interactions with toggle functionality.
+    user_rsvp is the user's prefetched RSVP for this event (or None)."""
     current_status = user_rsvp['participation'] if user_rsvp else None
     
     cols = st.columns(2)
@@ -887,68 +1189,111 @@ def handle_rsvp_buttons(event_uid, user_name, btn_key_prefix=""):
     out_text = "❌ Out" if current_status == "Out" else "Out"
     
     # Show the buttons side by side
-    if cols[0].button(in_text, key=f"{btn_key_prefix}in_{event_uid}", type=in_type):
-        if current_status == "In":
-            # If already "In", remove the RSVP
-            delete_rsvp(user_rsvp['id'])
-        else:
-            # Set status to "In"
-            user_id = get_or_create_user(user_name)
-            if current_status:  # If there's an existing RSVP
-                delete_rsvp(user_rsvp['id'])
-            add_rsvp(user_id, event_uid, "In", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-        st.rerun()
-        
-    if cols[1].button(out_text, key=f"{btn_key_prefix}out_{event_uid}", type=out_type):
-        if current_status == "Out":
-            # If already "Out", remove the RSVP
-            delete_rsvp(user_rsvp['id'])
-        else:
-            # Set status to "Out"
-            user_id = get_or_create_user(user_name)
-            if current_status:  # If there's an existing RSVP
-                delete_rsvp(user_rsvp['id'])
-            add_rsvp(user_id, event_uid, "Out", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-        st.rerun()
+    cols[0].button(in_text, key=f"{btn_key_prefix}in_{event_uid}", type=in_type,
+                   on_click=toggle_rsvp, args=(event_uid, user_name, "In", user_rsvp))
+    cols[1].button(out_text, key=f"{btn_key_prefix}out_{event_uid}", type=out_type,
+                   on_click=toggle_rsvp, args=(event_uid, user_name, "Out", user_rsvp))
         
     if current_status:
         st.caption(f"Click same button again to un-RSVP")
 
-def display_week_calendar(start_date, events):
-    """Display the current week as a grid calendar with interactive RSVPs."""
-    # Add custom CSS for weather forecast and game title styling
-    st.markdown("""
-        <style>
-        .weather-box {
-            background-color: rgba(255, 243, 176, 0.2);
-            padding: 10px;
-            border-radius: 8px;
-            margin: 10px 0;
-            border: 1px solid rgba(255, 223, 0, 0.3);
-        }
-        .game-title-box {
-            background-color: rgba(65, 105, 225, 0.1);
-            padding: 10px;
-            border-radius: 8px;
-            margin: 10px 0;
-            border: 1px solid rgba(65, 105, 225, 0.2);
-        }
-        </style>
-    """, unsafe_allow_html=True)
+def display_roster(in_players, out_players, labels=("✅ In:", "❌ Out:"),
+                   empty=("No one yet", "No one yet"), side_by_side=False):
+    """Show who's in and who's out from pre-joined name strings.
+    labels/empty set the heading and placeholder for each side; side_by_side puts them in two columns."""
+    if not (in_players or out_players):
+        st.write("No RSVPs yet")
+        return
+    
+    sections = st.columns(2) if side_by_side else (st.container(), st.container())
+    for section, label, players, placeholder in zip(sections, labels, (in_players, out_players), empty):
+        with section:
+            st.write(label)
+            st.write(players or placeholder)
+
+@st.fragment
+def display_event_rsvps(event_uid, rsvp_counts, rsvp_rosters, user_rsvp, rsvp_version,
+                        btn_key_prefix="", roster_in_expander=False):
+    """Show attendance, RSVP buttons and roster for one event.
+    Runs as a fragment, so an RSVP click reruns only this block. Once RSVP data has
+    changed since the page-level batch fetch (rsvp_version), just this event is refetched."""
+    if get_rsvp_version() != rsvp_version:
+        in_count, out_count = get_rsvp_counts(event_uid)
+        in_players, out_players = get_rsvp_rosters_bulk([event_uid])[event_uid]
+        user_rsvp = get_user_rsvp_for_event(st.session_state.user_name, event_uid)
+    else:
+        in_count, out_count = rsvp_counts.get(event_uid, (0, 0))
+        in_players, out_players = rsvp_rosters.get(event_uid, ("", ""))
+    
+    # Display attendance status with alerts
+    display_attendance_status(in_count)
+    
+    # Show detailed counts
+    cols = st.columns(2)
+    with cols[0]:
+        st.write("👍 In:", in_count)
+    with cols[1]:
+        st.write("👎 Out:", out_count)
+    
+    # Show RSVP buttons if user is logged in
+    if st.session_state.user_name:
+        handle_rsvp_buttons(event_uid, st.session_state.user_name, user_rsvp, btn_key_prefix)
     
-    weekday_names = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+    # Show who's in/out
+    if roster_in_expander:
+        with st.expander("See who's playing"):
+            display_roster(in_players, out_players)
+    else:
+        display_roster(in_players, out_players)
+
+@lru_cache(maxsize=512)
+def map_links_html(address):
+    """Google/Apple Maps link row for an address, built once per distinct address"""
+    maps_query = urllib.parse.quote_plus(address)
+    google_maps_url = f"https://www.google.com/maps/search/?api=1&query={maps_query}"
+    apple_maps_url = f"https://maps.apple.com/?q={maps_query}"
+    return f"""
+        <div class="maps-row">
+            <a class="maps-google" href="{google_maps_url}" target="_blank">Google Maps</a>
+            <a class="maps-apple" href="{apple_maps_url}" target="_blank">Apple Maps</a>
+        </div>
+    """
+
+def toggle_fields_map(map_key):
+    """Button callback: flip this event's fields map visibility"""
+    st.session_state[map_key] = not st.session_state.get(map_key, False)
+
+@st.fragment
+def display_fields_map(event_uid):
+    """Fields map toggle for one event.
+    Runs as a fragment, so showing or hiding the map reruns only this block."""
+    map_key = f"show_map_{event_uid}"
+    show_map = st.session_state.get(map_key, False)
+    
+    st.button("🗺️ Hide Fields Map" if show_map else "🗺️ See Fields Map",
+              key=f"map_button_{event_uid}", on_click=toggle_fields_map, args=(map_key,))
+    
+    if show_map:
+        st.image("wwt_map.png", use_container_width=True)
+
+def display_week_calendar(start_date, events, rsvp_counts, rsvp_rosters, user_rsvps_by_uid, rsvp_version):
+    """Display the current week as a grid calendar with interactive RSVPs."""
     week_dates = [start_date + timedelta(days=i) for i in range(7)]
     
+    # Bucket the events by day in one pass
+    events_by_day = defaultdict(list)
+    for event in events:
+        events_by_day[event.begin_date].append(event)
+    
     header_cols = st.columns(7)
-    for col, day_name, dt in zip(header_cols, weekday_names, week_dates):
+    for col, day_name, dt in zip(header_cols, WEEKDAY_NAMES, week_dates):
         col.markdown(f"**{day_name} {dt.day}**")
     
     day_cols = st.columns(7)
     for idx, dt in enumerate(week_dates):
         with day_cols[idx]:
-            day_events = [e for e in events if e.begin.date() == dt]
-            for event in day_events:
-                event_time = event.begin.format("h:mm A")
+            for event in events_by_day.get(dt, ()):
+                event_time = event.begin_time
                 
                 # Display game title and time in styled box
                 st.markdown(f"""
@@ -962,7 +1307,7 @@ def display_week_calendar(start_date, events):
                     field, address = clean_location(event.location)
 
                     # Add weather information with custom styling
-                    weather = get_weather_for_time(event.begin.datetime, address)
+                    weather = get_weather_for_time(event.begin_dt, address)
                     if weather:
                         st.markdown(f"""
                         <div class="weather-box">
@@ -980,143 +1325,50 @@ def display_week_calendar(start_date, events):
 
                     if address:
                         st.write(f"📍**Address**: {address}")
-                        maps_query = address.replace(' ', '+')
-                        google_maps_url = f"https://www.google.com/maps/search/?api=1&query={maps_query}"
-                        apple_maps_url = f"https://maps.apple.com/?q={maps_query}"
-
-                        st.markdown(f"""
-                            <div style="display: flex; gap: 10px; margin-top: 5px; margin-bottom: 10px;">
-                                <a href="{google_maps_url}" target="_blank">
-                                    <button style="background-color: #4285F4; color: white; padding: 6px 12px; border: none; border-radius: 5px;">
-                                        Google Maps
-                                    </button>
-                                </a>
-                                <a href="{apple_maps_url}" target="_blank">
-                                    <button style="background-color: #000000; color: white; padding: 6px 12px; border: none; border-radius: 5px;">
-                                        Apple Maps
-                                    </button>
-                                </a>
-                            </div>
-                        """, unsafe_allow_html=True)
+                        st.markdown(map_links_html(address), unsafe_allow_html=True)
 
                         # Only show Fields Map for Soccer Park location
                         if "1 Soccer Park Rd Fenton MO 63026" in address:
-                            # Initialize session state for this event's map visibility if not exists
-                            map_key = f"show_map_{event.uid}"
-                            if map_key not in st.session_state:
-                                st.session_state[map_key] = False
-
-                            # Button to toggle map visibility
-                            if st.button("🗺️ See Fields Map" if not st.session_state[map_key] else "🗺️ Hide Fields Map", 
-                                       key=f"map_button_{event.uid}"):
-                                st.session_state[map_key] = not st.session_state[map_key]
-                                st.rerun()
-                                
-                            # Show image if state is True
-                            if st.session_state[map_key]:
-                                st.image("wwt_map.png", use_container_width=True)
+                            display_fields_map(event.uid)
 
-                # Get attendance counts
-                in_count, out_count = get_rsvp_counts(event.uid)
-                
-                # Display attendance status with alerts
-                display_attendance_status(in_count)
-                
-                # Show detailed counts
-                cols = st.columns(2)
-                with cols[0]:
-                    st.write("👍 In:", in_count)
-                with cols[1]:
-                    st.write("👎 Out:", out_count)
-                
-                # Show RSVP buttons if user is logged in
-                if st.session_state.user_name:
-                    handle_rsvp_buttons(event.uid, st.session_state.user_name)
-                
-                # Show who's in/out
-                with st.expander("See who's playing"):
-                    rsvps = get_rsvp_list(event.uid)
-                    if rsvps:
-                        st.write("✅ In:")
-                        in_players = [rsvp['name'] for rsvp in rsvps if rsvp['participation'] == "In"]
-                        if in_players:
-                            st.write(", ".join(sorted(in_players)))
-                        else:
-                            st.write("No one yet")
-                        
-                        st.write("❌ Out:")
-                        out_players = [rsvp['name'] for rsvp in rsvps if rsvp['participation'] == "Out"]
-                        if out_players:
-                            st.write(", ".join(sorted(out_players)))
-                        else:
-                            st.write("No one yet")
-                    else:
-                        st.write("No RSVPs yet")
+                # Attendance, RSVP buttons and who's in/out
+                display_event_rsvps(
+                    event.uid, rsvp_counts, rsvp_rosters, user_rsvps_by_uid.get(event.uid),
+                    rsvp_version, roster_in_expander=True
+                )
                 
                 st.markdown("---")
 
-def display_future_events(events):
+def display_future_events(events, rsvp_counts, rsvp_rosters, user_rsvps_by_uid, rsvp_version):
     """Display future events in an interactive list format."""
     if not events:
         st.write("No future events.")
         return
         
-    events_sorted = sorted(events, key=lambda e: e.begin.date())
-    for event in events_sorted:
-        with st.expander(f"{event.begin.date()} {event.begin.format('h:mm A')} - {clean_game_name(event.name)}"):
+    # events arrive already sorted by start time
+    for event in events:
+        with st.expander(f"{event.begin_date} {event.begin_time} - {clean_game_name(event.name)}"):
 
-            in_count, out_count = get_rsvp_counts(event.uid)
-            
-            # Display attendance status with progress bar
-            display_attendance_status(in_count)
-            
-            # Show detailed counts
-            cols = st.columns(2)
-            with cols[0]:
-                st.write("👍 In:", in_count)
-            with cols[1]:
-                st.write("👎 Out:", out_count)
-            
-            # Show RSVP buttons if user is logged in
-            if st.session_state.user_name:
-                handle_rsvp_buttons(event.uid, st.session_state.user_name, "future_")
-            
-            # Show who's in/out
-            rsvps = get_rsvp_list(event.uid)
-            if rsvps:
-                st.write("✅ In:")
-                in_players = [rsvp['name'] for rsvp in rsvps if rsvp['participation'] == "In"]
-                if in_players:
-                    st.write(", ".join(sorted(in_players)))
-                else:
-                    st.write("No one yet")
-                    
-                st.write("❌ Out:")
-                out_players = [rsvp['name'] for rsvp in rsvps if rsvp['participation'] == "Out"]
-                if out_players:
-                    st.write(", ".join(sorted(out_players)))
-                else:
-                    st.write("No one yet")
-            else:
-                st.write("No RSVPs yet")
+            display_event_rsvps(
+                event.uid, rsvp_counts, rsvp_rosters, user_rsvps_by_uid.get(event.uid),
+                rsvp_version, btn_key_prefix="future_"
+            )
+
+PAST_GAMES_PER_PAGE = 10
 
 def display_past_games(past_events):
     """Display past games grouped by season"""
     try:
         # Get all games from database with results
-        response = supabase.table("games").select("*").order("start_time", desc=True).execute()
-        all_games = response.data
+        all_games = load_all_games()
         
         if not all_games:
             st.warning("No games found in database")
             return
         
-        # Filter to only past games, properly handling timezone-aware datetimes
-        today = datetime.now(timezone.utc)
-        past_games = [
-            game for game in all_games 
-            if datetime.fromisoformat(game['start_time']) < today
-        ]
+        # Games arrive ordered by start time, so the past ones are the prefix before now
+        now = datetime.now(timezone.utc)
+        past_games = all_games[:bisect.bisect_left(all_games, now, key=itemgetter('_start_dt'))]
         
         if not past_games:
             st.warning("No past games found")
@@ -1129,22 +1381,38 @@ def display_past_games(past_events):
             st.warning("No seasons could be determined")
             return
             
+        # Fetch attendance for every past game up front
+        past_uids = [game['event_uid'] for game in past_games]
+        rsvp_counts = get_rsvp_counts_bulk(past_uids)
+        rsvp_rosters = get_rsvp_rosters_bulk(past_uids)
+            
         # Create tabs for each season
         season_tabs = st.tabs([f"Season {i+1}" for i in range(len(seasons))])
         
         # Display each season in its own tab
         for season_idx, (season_games, tab) in enumerate(zip(seasons, season_tabs)):
             with tab:
-                season_start = datetime.fromisoformat(season_games[0]['start_time']).strftime('%Y-%m-%d')
-                season_end = datetime.fromisoformat(season_games[-1]['start_time']).strftime('%Y-%m-%d')
+                season_start = season_games[0]['_start_dt'].strftime('%Y-%m-%d')
+                season_end = season_games[-1]['_start_dt'].strftime('%Y-%m-%d')
                 st.subheader(f"Season {season_idx + 1} ({season_start} to {season_end})")
                 
+                # Sort games in descending order (newest first)
+                sorted_games = sorted(season_games, key=itemgetter('_start_dt'), reverse=True)
+                
+                # Page through long seasons instead of rendering every game at once
+                page_count = -(-len(sorted_games) // PAST_GAMES_PER_PAGE)
+                if page_count > 1:
+                    page = st.number_input(
+                        f"Page (of {page_count})", min_value=1, max_value=page_count, value=1,
+                        key=f"past_games_page_{season_idx}"
+                    )
+                    page_start = (page - 1) * PAST_GAMES_PER_PAGE
+                    sorted_games = sorted_games[page_start:page_start + PAST_GAMES_PER_PAGE]
+                
                 # Create a container for the games
                 with st.container():
-                    # Sort games in descending order (newest first)
-                    sorted_games = sorted(season_games, key=lambda x: x['start_time'], reverse=True)
                     for game in sorted_games:
-                        game_date = datetime.fromisoformat(game['start_time'])
+                        game_date = game['_start_dt']
                         game_time = game_date.strftime('%I:%M %p')
                         
                         st.markdown(f"### {game_date.date()} {game_time} - {clean_game_name(game['name'])}")
@@ -1157,7 +1425,7 @@ def display_past_games(past_events):
                                 st.success(f"📊 Result: Win {game['score']}")
                         
                         # Get attendance counts
-                        in_count, out_count = get_rsvp_counts(game['event_uid'])
+                        in_count, out_count = rsvp_counts.get(game['event_uid'], (0, 0))
                         
                         # Show attendance summary
                         cols = st.columns(2)
@@ -1168,24 +1436,13 @@ def display_past_games(past_events):
                                 st.write("🚫 **Declined**:", out_count)
                         
                         # Show who played
-                        rsvps = get_rsvp_list(game['event_uid'])
-                        if rsvps:
-                            col1, col2 = st.columns(2)
-                            with col1:
-                                st.write("✅ **Played:**")
-                                in_players = [rsvp['name'] for rsvp in rsvps if rsvp['participation'] == "In"]
-                                if in_players:
-                                    st.write(", ".join(sorted(in_players)))
-                                else:
-                                    st.write("No recorded attendance")
-                            
-                            with col2:
-                                st.write("❌ **Declined:**")
-                                out_players = [rsvp['name'] for rsvp in rsvps if rsvp['participation'] == "Out"]
-                                if out_players:
-                                    st.write(", ".join(sorted(out_players)))
-                                else:
-                                    st.write("None")
+                        in_players, out_players = rsvp_rosters.get(game['event_uid'], ("", ""))
+                        display_roster(
+                            in_players, out_players,
+                            labels=("✅ **Played:**", "❌ **Declined:**"),
+                            empty=("No recorded attendance", "None"),
+                            side_by_side=True
+                        )
                         
                         # Show the opponent and location
                         game_details = st.columns(2)
@@ -1203,30 +1460,28 @@ def display_past_games(past_events):
         return
 
 # --- SETUP CALENDAR VIEW ---
-today = date.today()  # Just get today's date
+now = datetime.now(timezone.utc)  # One clock reading shared by the whole run
+today = now.astimezone().date()  # Local calendar date
 current_week_start = today - timedelta(days=today.weekday())  # Monday
 current_week_end = current_week_start + timedelta(days=6)
 
-# Filter events using pure date comparison
-past_events = []
-current_week_events = []
-future_events = []
+# Events arrive sorted by date from the cached parse, so just slice the buckets at the date boundaries
+sorted_events = events
+past_end = bisect.bisect_left(sorted_events, today, key=attrgetter('begin_date'))
+week_end = bisect.bisect_right(sorted_events, current_week_end, key=attrgetter('begin_date'))
 
-for event in events:
-    event_date = event.begin.date()  # Get just the date without time
-    
-    # Simple date comparison
-    if event_date < today:  # Past events
-        past_events.append(event)
-    elif current_week_start <= event_date <= current_week_end:  # Current week
-        current_week_events.append(event)
-    else:  # Future events
-        future_events.append(event)
-
-# Sort all event lists
-current_week_events.sort(key=lambda e: e.begin.datetime)
-future_events.sort(key=lambda e: e.begin.datetime)
-past_events.sort(key=lambda e: e.begin.datetime, reverse=True)  # Most recent first
+past_events = sorted_events[:past_end][::-1]  # Most recent first
+current_week_events = sorted_events[past_end:week_end]
+future_events = sorted_events[week_end:]
+
+# Fetch RSVPs for every upcoming game, plus the user's own RSVPs, once per run
+rsvp_version = get_rsvp_version()
+# De-duplicated in feed order, as the bulk helpers key it, so every fetch_rsvp_rows call shares one cache entry
+upcoming_uids = list(dict.fromkeys(event.uid for event in current_week_events + future_events))
+rsvp_counts = get_rsvp_counts_bulk(upcoming_uids)
+rsvp_rosters = get_rsvp_rosters_bulk(upcoming_uids)
+user_rsvps = get_user_rsvps(st.session_state.user_name)
+user_rsvps_by_uid = {rsvp['event_uid']: rsvp for rsvp in user_rsvps}
 
 # --- STREAMLIT APP LAYOUT ---
 
@@ -1235,29 +1490,35 @@ tab1, tab2, tab3, tab4, tab5 = st.tabs(["This Week", "Future Games", "Past Games
 
 with tab1:
     st.header("Current Week Calendar")
-    display_week_calendar(current_week_start, current_week_events)
+    display_week_calendar(current_week_start, current_week_events, rsvp_counts, rsvp_rosters, user_rsvps_by_uid, rsvp_version)
     
     if current_week_events:
         st.subheader("Week Overview - RSVPs")
+        # Reuse the page-level batch of RSVP rows (same cache key), so the overview adds no queries
+        rows_by_uid = defaultdict(list)
+        for rsvp in fetch_rsvp_rows(tuple(upcoming_uids), rsvp_version):
+            rows_by_uid[rsvp['event_uid']].append(rsvp)
+        
         all_rsvps = []
         for event in current_week_events:
-            # Get RSVPs for this event
-            rsvps = get_rsvp_list(event.uid)
-            rsvp_data = supabase.table("rsvps").select(
-                "users:user_id(name), participation, timestamp"
-            ).eq("event_uid", event.uid).execute()
-            
-            if rsvp_data.data:
-                for rsvp in rsvp_data.data:
-                    all_rsvps.append({
-                        "Game": f"{event.name} ({event.begin.format('MM/DD')})",
-                        "Player": rsvp['users']['name'].title(),
-                        "Status": rsvp['participation'],
-                        "RSVP Date": pd.to_datetime(rsvp['timestamp']).strftime("%m/%d")
-                    })
+            game_label = f"{event.name} ({event.begin_dt.strftime('%m/%d')})"
+            for rsvp in rows_by_uid[event.uid]:
+                all_rsvps.append({
+                    "Game": game_label,
+                    "Player": rsvp['users']['name'],
+                    "Status": rsvp['participation'],
+                    "RSVP Date": rsvp['timestamp']
+                })
         
         if all_rsvps:
             df_rsvps = pd.DataFrame(all_rsvps)
+            # Format whole columns at once rather than per row
+            df_rsvps["Player"] = df_rsvps["Player"].str.title()
+            # Older rows use "YYYY-MM-DD HH:MM:SS", newer ones full ISO-8601 with an offset
+            # and optional fractions, so parse each element as ISO-8601 rather than one inferred format
+            df_rsvps["RSVP Date"] = pd.to_datetime(
+                df_rsvps["RSVP Date"], utc=True, format="ISO8601"
+            ).dt.strftime("%m/%d")
             st.dataframe(
                 df_rsvps,
                 column_config={
@@ -1277,8 +1538,8 @@ with tab1:
 with tab2:
     st.header("Future Games")
     if future_events:
-        st.info(f"Showing all {future_events} upcoming games")
-        display_future_events(future_events)
+        st.info(f"Showing all {len(future_events)} upcoming games")
+        display_future_events(future_events, rsvp_counts, rsvp_rosters, user_rsvps_by_uid, rsvp_version)
     else:
         st.warning("No future games scheduled yet")
 
@@ -1288,33 +1549,33 @@ with tab3:
 
 with tab4:
     st.header("My RSVPs")
-    user_rsvps = [rsvp for rsvp in get_all_rsvps() if rsvp['name'].lower() == st.session_state.user_name.lower()]
-    
     if user_rsvps:
         upcoming_rsvps = []
         past_rsvps = []
-        now = datetime.now(timezone.utc)
         
-        for rsvp in user_rsvps:
-            event = next((e for e in events if e.uid == rsvp['event_uid']), None)
-            if event:
-                if event.begin.datetime > now:
+        # Walk the pre-sorted events so both lists come out in chronological order
+        for event in sorted_events:
+            rsvp = user_rsvps_by_uid.get(event.uid)
+            if rsvp:
+                if event.begin_dt > now:
                     upcoming_rsvps.append((event, rsvp))
                 else:
                     past_rsvps.append((event, rsvp))
         
         if upcoming_rsvps:
             st.subheader("Upcoming Games")
-            for event, rsvp in sorted(upcoming_rsvps, key=lambda x: x[0].begin.datetime):
-                with st.expander(f"{event.begin.date()} {event.begin.format('h:mm A')} - {event.name}"):
+            for event, rsvp in upcoming_rsvps:
+                with st.expander(f"{event.begin_date} {event.begin_time} - {event.name}"):
 
-                    st.write(f"RSVP'd on: {rsvp['timestamp']}")
-                    handle_rsvp_buttons(event.uid, st.session_state.user_name, "my_")
+                    # Stored as ISO 8601 with an offset (older rows without); show it as before
+                    rsvp_time = datetime.fromisoformat(rsvp['timestamp']).strftime("%Y-%m-%d %H:%M:%S")
+                    st.write(f"RSVP'd on: {rsvp_time}")
+                    handle_rsvp_buttons(event.uid, st.session_state.user_name, rsvp, "my_")
         
         if past_rsvps:
             st.subheader("Past Games")
-            for event, rsvp in sorted(past_rsvps, key=lambda x: x[0].begin.datetime, reverse=True)[:5]:
-                st.write(f"🎮 {event.begin.date()} - {event.name}: {rsvp['participation']}")
+            for event, rsvp in reversed(past_rsvps[-5:]):  # Five most recent first
+                st.write(f"🎮 {event.begin_date} - {event.name}: {rsvp['participation']}")
     else:
         st.write("You haven't RSVP'd for any games yet.")
         
@@ -1322,8 +1583,7 @@ with tab4:
     if st.button("Clear all my RSVPs", type="secondary"):
         user_id = get_or_create_user(st.session_state.user_name)
         if user_id:
-            for rsvp in user_rsvps:
-                delete_rsvp(rsvp['id'])
+            delete_rsvps([rsvp['id'] for rsvp in user_rsvps])
             st.success("All your RSVPs have been cleared!")
             st.rerun()
 